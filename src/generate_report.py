@@ -1,11 +1,20 @@
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
 from dateutil import tz
 import os
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+from numba import njit
 
-ALLOWED_STATUSES = {"New", "In Progress", "Completed", "On Hold"}
+ALLOWED_STATUSES = frozenset({"New", "In Progress", "Completed", "On Hold"})
+ACTIVE_STATUSES = frozenset({"In Progress", "Completed", "On Hold"})
+TRUTHY_ASSIGN = frozenset({"yes", "y", "true", "1"})
+
+# int64 view of NaT, and ns per day for datetime64[ns] arithmetic
+_NAT_I8 = np.iinfo(np.int64).min
+_NS_PER_DAY = 86_400_000_000_000
 
 REQUIRED_COLUMNS = [
     "claim_id",
@@ -39,20 +48,121 @@ def last_full_week():
     start = end - timedelta(days=6)            # previous Monday
     return start, end
 
-def load_data(path):
-    df = pd.read_csv(path, dtype=str).fillna("")
-    # Parse dates safely
+# Schema columns are read as Arrow strings explicitly: left to inference,
+# a True/False is_assignment comes back bool and an all-blank column comes
+# back null/double, and the .str normalization in _normalize would raise.
+# Keys for columns absent from a file are ignored by read_csv.
+_READ_DTYPES = {c: "string[pyarrow]" for c in REQUIRED_COLUMNS}
+
+# Rows per chunk when streaming large CSVs through load_and_filter
+CHUNK_ROWS = 200_000
+
+def _normalize(df):
+    # Parse dates safely; explicit format skips inference and cache=True
+    # collapses repeated date strings to a single strptime each.
+    # Kept as datetime64[ns] (no .dt.date) so downstream ops stay vectorized.
     for c in ["received_date", "assigned_date", "completed_date"]:
         if c in df.columns:
-            df[c] = pd.to_datetime(df[c], errors="coerce").dt.date
+            df[c] = pd.to_datetime(df[c], errors="coerce", format="ISO8601", cache=True)
     # Normalize strings
     for c in ["branch", "line_of_service", "status", "is_assignment", "assigned_pm"]:
         if c in df.columns:
-            df[c] = df[c].astype(str).str.strip()
+            df[c] = df[c].str.strip()
+    return df
+
+# No cache=True for the same module-path reason as _sla_kernel below
+@njit
+def _truthy_flag_kernel(offsets, data, out):
+    # Byte compares against "1"/"y"/"yes"/"true"; | 0x20 lowercases ASCII
+    # letters, and null/empty slots (zero-length) fall out as False
+    for i in range(out.shape[0]):
+        s = offsets[i]
+        n = offsets[i + 1] - s
+        if n == 1:
+            c = data[s]
+            out[i] = c == 0x31 or (c | 0x20) == 0x79
+        elif n == 3:
+            out[i] = (
+                (data[s] | 0x20) == 0x79
+                and (data[s + 1] | 0x20) == 0x65
+                and (data[s + 2] | 0x20) == 0x73
+            )
+        elif n == 4:
+            out[i] = (
+                (data[s] | 0x20) == 0x74
+                and (data[s + 1] | 0x20) == 0x72
+                and (data[s + 2] | 0x20) == 0x75
+                and (data[s + 3] | 0x20) == 0x65
+            )
+        else:
+            out[i] = False
+
+def _is_pyarrow_string(dtype):
+    # Both spellings of a pyarrow-backed string column: pd.ArrowDtype
+    # (dtype_backend="pyarrow" inference) and pd.StringDtype with pyarrow
+    # storage (the "string[pyarrow]" entries in _READ_DTYPES)
+    if isinstance(dtype, pd.ArrowDtype):
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == "pyarrow"
+
+def _truthy_flags(series):
+    # Decide membership straight off the Arrow string buffers (offsets +
+    # UTF-8 bytes) instead of allocating a lowercased copy of the column
+    if not _is_pyarrow_string(series.dtype):
+        # Object-dtype frames, or a flag column that arrived as bool/int:
+        # render to str first ("True" lowercases into TRUTHY_ASSIGN)
+        coerced = series.astype(str).str.lower().isin(TRUTHY_ASSIGN)
+        return coerced.to_numpy(dtype=bool, na_value=False)
+    arr = series.array._pa_array.combine_chunks()
+    offsets_dtype = np.int64 if pa.types.is_large_string(arr.type) else np.int32
+    buffers = arr.buffers()
+    offsets = np.frombuffer(buffers[1], dtype=offsets_dtype)
+    data = np.frombuffer(buffers[2], dtype=np.uint8) if buffers[2] is not None else np.empty(0, dtype=np.uint8)
+    out = np.empty(len(arr), dtype=np.bool_)
+    _truthy_flag_kernel(offsets, data, out)
+    return out
+
+def _finalize(df):
+    # Low-cardinality columns as category: counts/isin run on int codes
+    # instead of re-hashing strings every pass
+    for c in ["branch", "line_of_service", "status", "assigned_pm"]:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    # Flag scan done once here; validate and compute_kpis reuse it
+    if "is_assignment" in df.columns:
+        df["_is_assignment_bool"] = _truthy_flags(df["is_assignment"])
     return df
 
+def load_data(path):
+    # Arrow-backed strings are contiguous buffers instead of per-row Python
+    # objects; real claim exports have ragged rows, so keep the tolerant C
+    # parser rather than engine="pyarrow". Missing values stay NA (no fillna).
+    df = pd.read_csv(path, dtype=_READ_DTYPES, dtype_backend="pyarrow")
+    return _finalize(_normalize(df))
+
+def load_and_filter(path, start, end):
+    # Stream the CSV in chunks and keep only the target week, so peak
+    # memory is one chunk plus the filtered slice instead of the full file
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    keep = []
+    for chunk in pd.read_csv(path, dtype=_READ_DTYPES, dtype_backend="pyarrow", chunksize=CHUNK_ROWS):
+        chunk = _normalize(chunk)
+        keep.append(chunk.loc[chunk["received_date"].between(start, end)])
+    if not keep:
+        return filter_week(load_data(path), start, end)
+    return _finalize(pd.concat(keep).copy())
+
+def _is_blank(s):
+    # Columns loaded via load_data carry real NAs instead of ""; treat both as blank
+    return s.isna() | s.eq("")
+
+def _assignment_mask(df):
+    if "_is_assignment_bool" in df.columns:
+        return df["_is_assignment_bool"]
+    return pd.Series(_truthy_flags(df["is_assignment"]), index=df.index)
+
 def filter_week(df, start, end):
-    mask = (df["received_date"] >= start) & (df["received_date"] <= end)
+    mask = df["received_date"].between(pd.Timestamp(start), pd.Timestamp(end))
     return df.loc[mask].copy()
 
 def validate(df):
@@ -64,96 +174,208 @@ def validate(df):
         errors.append({"row": "-", "field": "schema", "issue": f"Missing required columns: {missing_cols}"})
         return pd.DataFrame(errors)
 
-    # Row-level checks
-    for idx, row in df.iterrows():
-        if row["status"] and row["status"] not in ALLOWED_STATUSES:
-            errors.append({"row": idx, "field": "status", "issue": f"Invalid status '{row['status']}'"})
-
-        # If assigned/active, should have DASH job id
-        if row["status"] in {"In Progress", "Completed", "On Hold"} and not row["dash_job_id"]:
-            errors.append({"row": idx, "field": "dash_job_id", "issue": "Missing DASH job id for active/closed claim"})
-
-        # If assigned, should have assigned PM and date
-        if row["is_assignment"].lower() in {"yes", "y", "true", "1"}:
-            if not row["assigned_pm"]:
-                errors.append({"row": idx, "field": "assigned_pm", "issue": "Missing assigned PM on assignment"})
-            if pd.isna(row["assigned_date"]):
-                errors.append({"row": idx, "field": "assigned_date", "issue": "Missing assigned_date on assignment"})
-
-    return pd.DataFrame(errors)
+    # Row-level checks as vectorized masks (no per-row Python loop)
+    status = df["status"]
+    is_assign = _assignment_mask(df)
+
+    bad_status = status.notna() & status.ne("") & ~status.isin(ALLOWED_STATUSES)
+    # If assigned/active, should have DASH job id
+    need_dash = status.isin(ACTIVE_STATUSES) & _is_blank(df["dash_job_id"])
+    # If assigned, should have assigned PM and date
+    miss_pm = is_assign & _is_blank(df["assigned_pm"])
+    miss_date = is_assign & df["assigned_date"].isna()
+
+    frames = []
+    if bad_status.any():
+        frames.append(pd.DataFrame({
+            "row": df.index[bad_status],
+            "field": "status",
+            "issue": ("Invalid status '" + status[bad_status].astype(str) + "'").to_numpy(),
+        }))
+    for mask, field, issue in [
+        (need_dash, "dash_job_id", "Missing DASH job id for active/closed claim"),
+        (miss_pm, "assigned_pm", "Missing assigned PM on assignment"),
+        (miss_date, "assigned_date", "Missing assigned_date on assignment"),
+    ]:
+        if mask.any():
+            frames.append(pd.DataFrame({"row": df.index[mask], "field": field, "issue": issue}))
+
+    if not frames:
+        return pd.DataFrame(errors)
+    return pd.concat(frames, ignore_index=True).sort_values("row", kind="stable", ignore_index=True)
+
+# No cache=True: the module is run both as a script and as src.generate_report
+# in tests, and numba's disk cache keys on one module path only
+@njit
+def _sla_kernel(received, assigned, completed, sla_assign_days, sla_complete_days):
+    # One fused pass over the int64 date views: lag sums/counts for the
+    # averages and both SLA-breach counts from a single read of each row
+    sum_a = 0.0
+    cnt_a = 0
+    breach_a = 0
+    sum_c = 0.0
+    cnt_c = 0
+    breach_c = 0
+    for i in range(received.shape[0]):
+        r = received[i]
+        if r == _NAT_I8:
+            continue
+        a = assigned[i]
+        if a != _NAT_I8:
+            d = (a - r) // _NS_PER_DAY
+            sum_a += d
+            cnt_a += 1
+            if d > sla_assign_days:
+                breach_a += 1
+        c = completed[i]
+        if c != _NAT_I8:
+            d = (c - r) // _NS_PER_DAY
+            sum_c += d
+            cnt_c += 1
+            if d > sla_complete_days:
+                breach_c += 1
+    return sum_a, cnt_a, breach_a, sum_c, cnt_c, breach_c
+
+def _date_i8(df, col):
+    return np.asarray(df[col], dtype="datetime64[ns]").view("i8")
 
 def compute_kpis(df, sla_assign_days=1, sla_complete_days=7):
     out = {}
 
     total = len(df)
     out["Total Claims"] = total
-    out["Assignments"] = int((df["is_assignment"].str.lower().isin(["yes","y","true","1"])).sum())
+    out["Assignments"] = int(_assignment_mask(df).sum())
     out["Non-Assignments"] = total - out["Assignments"]
 
-    # Status distribution
+    # Status distribution: one bincount over the category codes instead of
+    # four full equality scans (astype is a no-op for load_data frames)
+    status_cat = df["status"].astype("category")
+    codes = status_cat.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(status_cat.cat.categories))
+    status_counts = dict(zip(status_cat.cat.categories, counts))
     for s in ["New", "In Progress", "Completed", "On Hold"]:
-        out[f"Status: {s}"] = int((df["status"] == s).sum())
-
-    # Lags
-    df["assign_lag_days"] = (pd.to_datetime(df["assigned_date"]) - pd.to_datetime(df["received_date"])).dt.days
-    df["resolution_days"] = (pd.to_datetime(df["completed_date"]) - pd.to_datetime(df["received_date"])).dt.days
-
-    # Averages (drop NaN)
-    out["Avg Assign Lag (days)"] = round(float(df["assign_lag_days"].dropna().mean()), 2) if df["assign_lag_days"].notna().any() else np.nan
-    out["Avg Resolution (days)"] = round(float(df["resolution_days"].dropna().mean()), 2) if df["resolution_days"].notna().any() else np.nan
-
-    # SLA breaches
-    assign_breaches = ((df["assign_lag_days"] > sla_assign_days)).sum()
-    # Only completed/in progress for completion SLA baseline
-    comp_mask = df["resolution_days"].notna()
-    complete_breaches = ((df.loc[comp_mask, "resolution_days"] > sla_complete_days)).sum()
+        out[f"Status: {s}"] = int(status_counts.get(s, 0))
+
+    # Lag averages and SLA breaches in one fused pass; rows with a
+    # missing date contribute to neither. Nothing is written back to df,
+    # so the caller's frame (and the Raw Data sheet) stays untouched.
+    sum_a, cnt_a, assign_breaches, sum_c, cnt_c, complete_breaches = _sla_kernel(
+        _date_i8(df, "received_date"),
+        _date_i8(df, "assigned_date"),
+        _date_i8(df, "completed_date"),
+        sla_assign_days,
+        sla_complete_days,
+    )
+    out["Avg Assign Lag (days)"] = round(sum_a / cnt_a, 2) if cnt_a else np.nan
+    out["Avg Resolution (days)"] = round(sum_c / cnt_c, 2) if cnt_c else np.nan
     out[f"SLA Breaches: Assign>{sla_assign_days}d"] = int(assign_breaches)
     out[f"SLA Breaches: Complete>{sla_complete_days}d"] = int(complete_breaches)
 
-    # Groupings
-    by_branch = df.groupby("branch", dropna=False)["claim_id"].count().reset_index(name="count").sort_values("count", ascending=False)
-    by_service = df.groupby("line_of_service", dropna=False)["claim_id"].count().reset_index(name="count").sort_values("count", ascending=False)
-    by_pm = df.groupby("assigned_pm", dropna=False)["claim_id"].count().reset_index(name="count").sort_values("count", ascending=False)
+    # Groupings: value_counts is a single hashtable pass and comes back
+    # sorted by count, so no groupby machinery or extra sort_values.
+    # The three scans are independent and release the GIL inside the
+    # count kernels, so overlap them across threads.
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        by_branch, by_service, by_pm = ex.map(
+            lambda c: _count_by(df, c), ["branch", "line_of_service", "assigned_pm"]
+        )
 
     return out, by_branch, by_service, by_pm
 
+def _count_by(df, col):
+    counts = df[col].value_counts(dropna=False)
+    # Categorical columns keep categories from the full file; drop the
+    # zero-count rows for values not present in the filtered week
+    # (the observed=True behavior groupby would have given us)
+    counts = counts[counts > 0]
+    return counts.rename_axis(col).reset_index(name="count")
+
+def _sheet_values(df):
+    # Dates become ISO strings and NA becomes "" so rows can stream
+    # straight to the worksheet without per-cell type dispatch
+    out = df.copy()
+    for c in out.columns:
+        if pd.api.types.is_datetime64_any_dtype(out[c]):
+            out[c] = out[c].dt.strftime("%Y-%m-%d")
+    out = out.astype(object)
+    return out.where(out.notna(), "")
+
+def _frame_rows(df):
+    # Header plus the stringified cell rows; safe to run off-thread since
+    # it only touches its own frame
+    return [str(c) for c in df.columns], _sheet_values(df).to_numpy().tolist()
+
+def _write_rows(worksheet, header, rows, startrow=0):
+    # Stream the sheet row by row instead of going through to_excel,
+    # which builds a per-cell formatter pass over the whole sheet
+    worksheet.write_row(startrow, 0, header)
+    for i, row in enumerate(rows, startrow + 1):
+        worksheet.write_row(i, 0, row)
+
 def write_excel(outdir, report_date, kpis, by_branch, by_service, by_pm, df_week, errors_df):
     os.makedirs(outdir, exist_ok=True)
     path = os.path.join(outdir, f"weekly_report_{report_date}.xlsx")
 
-    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
-        # Summary sheet (KPIs)
-        summary_df = pd.DataFrame(list(kpis.items()), columns=["Metric", "Value"])
-        summary_df.to_excel(writer, sheet_name="Summary", index=False, startrow=1)
-
-        # Other sheets
-        by_branch.to_excel(writer, sheet_name="By Branch", index=False)
-        by_service.to_excel(writer, sheet_name="By Service", index=False)
-        by_pm.to_excel(writer, sheet_name="By PM", index=False)
-        df_week.to_excel(writer, sheet_name="Raw Data", index=False)
-        if not errors_df.empty:
-            errors_df.to_excel(writer, sheet_name="Errors", index=False)
-
-        # Simple chart on Summary
-        workbook  = writer.book
-        worksheet = writer.sheets["Summary"]
-        worksheet.write(0, 0, "Weekly Repair Claims — Summary")
-
-        # Add a column chart for By Branch counts
-        chart_sheet = "By Branch"
-        chart = workbook.add_chart({"type": "column"})
-        # Categories (branches) and values (counts); rows start at 1 due to header
-        chart.add_series({
-            "name":       "Claims by Branch",
-            "categories": f"='{chart_sheet}'!$A$2:$A${len(by_branch)+1}",
-            "values":     f"='{chart_sheet}'!$B$2:$B${len(by_branch)+1}",
-        })
-        chart.set_title({"name": "Claims by Branch"})
-        chart.set_x_axis({"name": "Branch"})
-        chart.set_y_axis({"name": "Count"})
-
-        # Insert chart on Summary
-        worksheet.insert_chart("D2", chart)
+    # Internal helper columns (underscore-prefixed) stay out of the report
+    raw = df_week.loc[:, [c for c in df_week.columns if not c.startswith("_")]]
+    sheets = [
+        ("By Branch", by_branch),
+        ("By Service", by_service),
+        ("By PM", by_pm),
+        ("Raw Data", raw),
+    ]
+    if not errors_df.empty:
+        sheets.append(("Errors", errors_df))
+
+    # Sheet writing is serialized through one ZipFile, but stringifying each
+    # frame's rows is independent work — kick it off before opening the
+    # writer so conversion overlaps with the Summary/early-sheet writes
+    with ThreadPoolExecutor(max_workers=len(sheets)) as ex:
+        pending = [(name, ex.submit(_frame_rows, frame)) for name, frame in sheets]
+
+        # constant_memory flushes each finished row to disk and writes strings
+        # inline, so no cell table or shared-strings table is kept in memory.
+        # It requires rows to be written top-to-bottom, which _write_rows does.
+        options = {"constant_memory": True}
+        with pd.ExcelWriter(path, engine="xlsxwriter", engine_kwargs={"options": options}) as writer:
+            workbook = writer.book
+
+            # Summary sheet (KPIs); added first so it stays the first tab
+            worksheet = workbook.add_worksheet("Summary")
+            writer.sheets["Summary"] = worksheet
+            worksheet.write(0, 0, "Weekly Repair Claims — Summary")
+            # The KPI dict is small; write it directly rather than round-tripping
+            # through a throwaway DataFrame
+            worksheet.write_row(1, 0, ["Metric", "Value"])
+            for i, (metric, value) in enumerate(kpis.items(), 2):
+                worksheet.write_string(i, 0, metric)
+                if pd.isna(value):
+                    worksheet.write_blank(i, 1, None)
+                else:
+                    worksheet.write(i, 1, value)
+
+            # Other sheets, streamed row by row
+            for name, fut in pending:
+                header, rows = fut.result()
+                _write_rows(workbook.add_worksheet(name), header, rows)
+
+            # Add a column chart for By Branch counts; an empty week would
+            # produce a $A$2:$A$1 range that Excel flags, so skip it entirely
+            if len(by_branch) > 0:
+                chart_sheet = "By Branch"
+                chart = workbook.add_chart({"type": "column"})
+                # Categories (branches) and values (counts); rows start at 1 due to header
+                chart.add_series({
+                    "name":       "Claims by Branch",
+                    "categories": f"='{chart_sheet}'!$A$2:$A${len(by_branch)+1}",
+                    "values":     f"='{chart_sheet}'!$B$2:$B${len(by_branch)+1}",
+                })
+                chart.set_title({"name": "Claims by Branch"})
+                chart.set_x_axis({"name": "Branch"})
+                chart.set_y_axis({"name": "Count"})
+
+                # Insert chart on Summary
+                worksheet.insert_chart("D2", chart)
 
     return path
 
@@ -166,8 +388,7 @@ def main():
     else:
         start, end = last_full_week()
 
-    df = load_data(args.input)
-    df_week = filter_week(df, start, end)
+    df_week = load_and_filter(args.input, start, end)
 
     errors_df = validate(df_week)
     kpis, by_branch, by_service, by_pm = compute_kpis(
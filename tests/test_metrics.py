@@ -1,6 +1,7 @@
+import zipfile
 import pandas as pd
-from datetime import date
-from src.generate_report import compute_kpis
+import src.generate_report as generate_report
+from src.generate_report import compute_kpis, load_data, validate, write_excel
 
 def test_compute_kpis_basic():
     data = {
@@ -8,15 +9,79 @@ def test_compute_kpis_basic():
         "branch": ["X", "X", "Y"],
         "line_of_service": ["Mitigation", "Mitigation", "Reconstruction"],
         "is_assignment": ["Yes", "No", "Yes"],
-        "received_date": [date(2025,9,22)]*3,
+        "received_date": pd.to_datetime(["2025-09-22"]*3),
         "assigned_pm": ["Alex", "", "Jamie"],
-        "assigned_date": [date(2025,9,22), None, date(2025,9,23)],
+        "assigned_date": pd.to_datetime(["2025-09-22", None, "2025-09-23"]),
         "status": ["Completed","New","In Progress"],
         "dash_job_id": ["D-1","","D-2"],
-        "completed_date": [date(2025,9,25), None, None],
+        "completed_date": pd.to_datetime(["2025-09-25", None, None]),
     }
     df = pd.DataFrame(data)
     kpis, by_branch, by_service, by_pm = compute_kpis(df, 1, 7)
     assert kpis["Total Claims"] == 3
     assert kpis["Status: Completed"] == 1
     assert by_branch["count"].sum() == 3
+
+def test_validate_flags_bad_rows():
+    data = {
+        "claim_id": ["A", "B", "C"],
+        "branch": ["X", "X", "Y"],
+        "line_of_service": ["Mitigation", "Mitigation", "Reconstruction"],
+        "is_assignment": ["Yes", "No", "Yes"],
+        "received_date": pd.to_datetime(["2025-09-22"]*3),
+        "assigned_pm": ["Alex", "", ""],
+        "assigned_date": pd.to_datetime(["2025-09-22", None, None]),
+        "status": ["Completed", "Bogus", "In Progress"],
+        "dash_job_id": ["D-1", "", ""],
+        "completed_date": pd.to_datetime(["2025-09-25", None, None]),
+    }
+    errors = validate(pd.DataFrame(data))
+    issues = set(zip(errors["row"], errors["field"]))
+    assert (1, "status") in issues
+    assert (2, "dash_job_id") in issues
+    assert (2, "assigned_pm") in issues
+    assert (2, "assigned_date") in issues
+    assert (0, "status") not in issues
+
+def test_load_data_keeps_schema_columns_as_strings(tmp_path, monkeypatch):
+    # True/False flags and an all-blank assigned_pm would type-infer as
+    # bool and null without the explicit dtype map, crashing normalization
+    csv_path = tmp_path / "claims.csv"
+    csv_path.write_text(
+        "claim_id,branch,line_of_service,is_assignment,received_date,assigned_pm,assigned_date,status,dash_job_id,completed_date\n"
+        "C-1,X,Mitigation,True,2025-09-22,,,New,,\n"
+        "C-2,Y,Mitigation,False,2025-09-23,,,New,,\n"
+    )
+    # Spy on the Arrow-buffer kernel: load_data frames must take it,
+    # not the astype(str) fallback
+    kernel = generate_report._truthy_flag_kernel
+    kernel_calls = []
+    def spy(offsets, data, out):
+        kernel_calls.append(len(out))
+        return kernel(offsets, data, out)
+    monkeypatch.setattr(generate_report, "_truthy_flag_kernel", spy)
+    df = load_data(str(csv_path))
+    assert kernel_calls == [2]
+    assert df["_is_assignment_bool"].tolist() == [True, False]
+    assert df["assigned_pm"].isna().all()
+
+def test_write_excel_embeds_branch_chart(tmp_path):
+    data = {
+        "claim_id": ["A", "B", "C"],
+        "branch": ["X", "X", "Y"],
+        "line_of_service": ["Mitigation", "Mitigation", "Reconstruction"],
+        "is_assignment": ["Yes", "No", "Yes"],
+        "received_date": pd.to_datetime(["2025-09-22"]*3),
+        "assigned_pm": ["Alex", "", "Jamie"],
+        "assigned_date": pd.to_datetime(["2025-09-22", None, "2025-09-23"]),
+        "status": ["Completed","New","In Progress"],
+        "dash_job_id": ["D-1","","D-2"],
+        "completed_date": pd.to_datetime(["2025-09-25", None, None]),
+    }
+    df = pd.DataFrame(data)
+    kpis, by_branch, by_service, by_pm = compute_kpis(df, 1, 7)
+    path = write_excel(str(tmp_path), "2025-09-28", kpis, by_branch, by_service, by_pm, df, pd.DataFrame())
+    # The chart must survive into the workbook (it is silently dropped if
+    # added after the writer context closes)
+    with zipfile.ZipFile(path) as zf:
+        assert "xl/charts/chart1.xml" in zf.namelist()